@@ -22,13 +22,15 @@ from pinecone import Pinecone
 
 # Import your service modules
 from app.services.embedding import get_embedding
-from app.services.vectorstore import query_vector_store
+from app.services.vectorstore import query_vector_store, SIMILARITY_METRICS
+from app.services.router import route_query
 from app.services.llm import generate_answer_from_context
 
 # --- Pinecone Initialization Function ---
 
 def initialize_pinecone_index():
     """Initializes and returns a Pinecone index object."""
+    global pinecone_index_metric
     PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
     PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
     PINECONE_ENVIRONMENT = os.getenv("PINECONE_ENVIRONMENT")
@@ -48,6 +50,14 @@ def initialize_pinecone_index():
             print(f"Pinecone index '{PINECONE_INDEX_NAME}' not found. Please create it.")
             return None
 
+        # Retrieval orders and thresholds scores differently for distance metrics
+        try:
+            pinecone_index_metric = pc.describe_index(PINECONE_INDEX_NAME).metric
+        except Exception as e:
+            print(f"Could not read Pinecone index metric, assuming '{pinecone_index_metric}': {e}")
+        if pinecone_index_metric not in SIMILARITY_METRICS:
+            print(f"Warning: Pinecone index uses the '{pinecone_index_metric}' metric; score dropoff and weak-match fallback are disabled.")
+
         index = pc.Index(PINECONE_INDEX_NAME)
         print("Pinecone index initialized successfully.")
         return index
@@ -57,6 +67,7 @@ def initialize_pinecone_index():
 
 # --- Initialize Pinecone at Module Level ---
 
+pinecone_index_metric = "cosine"
 pinecone_index_obj = initialize_pinecone_index()
 
 # --- FastAPI App Setup ---
@@ -117,8 +128,9 @@ async def chatbot_endpoint(req: ChatRequest):
     if query_embedding is None:
         return ChatResponse(reply="Sorry, embedding failed. Please try again.")
 
-    # 2. Search Pinecone
-    relevant_context = query_vector_store(pinecone_index_obj, query_embedding, top_k=5)
+    # 2. Search Pinecone in the namespaces relevant to the query
+    namespaces = route_query(user_message)
+    relevant_context = query_vector_store(pinecone_index_obj, query_embedding, top_k=5, namespaces=namespaces, metric=pinecone_index_metric)
     if not relevant_context:
         reply = "Sorry, I couldn't find information about that."
     else:
@@ -193,8 +205,9 @@ async def add_message_and_get_reply(conversation_id: str, req: ChatRequest):
         if query_embedding is None:
             print("Embedding failed. Cannot perform vector search.")
         else:
-            # Query Pinecone for relevant documents
-            relevant_context = query_vector_store(pinecone_index_obj, query_embedding, top_k=5)
+            # Query Pinecone for relevant documents in the routed namespaces
+            namespaces = route_query(user_message_text)
+            relevant_context = query_vector_store(pinecone_index_obj, query_embedding, top_k=5, namespaces=namespaces, metric=pinecone_index_metric)
 
             if not relevant_context:
                 print("No relevant documents found in Pinecone.")
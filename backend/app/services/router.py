@@ -0,0 +1,60 @@
+# backend/app/services/router.py
+
+import os
+import re
+
+# Source PDFs, each ingested into its own Pinecone namespace.
+# Ingestion and full-search fallback both read this list, so a new catalog only needs adding here.
+SOURCE_PDFS = [
+    "GENERAL.pdf",
+    "CONTACTS.pdf",
+]
+
+# Catch-all namespace, searched when no keyword matches and alongside any
+# keyword match that is not a strong signal.
+DEFAULT_NAMESPACE = "general"
+
+# Keywords that point a query at a specific namespace. Keep these specific:
+# generic words ("who", "hours", "office") also appear in general catalog questions.
+NAMESPACE_KEYWORDS = {
+    "contacts": {"phone", "email", "e-mail", "fax", "extension", "contact"},
+}
+
+# A query needs this many keyword hits before the default namespace is skipped.
+STRONG_MATCH_MIN_HITS = 2
+
+def namespace_for_source(pdf_file: str) -> str:
+    """Returns the namespace a source PDF is ingested into (e.g. CONTACTS.pdf -> contacts)."""
+    return os.path.splitext(os.path.basename(pdf_file))[0].lower()
+
+ALL_NAMESPACES = [namespace_for_source(pdf_file) for pdf_file in SOURCE_PDFS]
+
+for _namespace in [DEFAULT_NAMESPACE, *NAMESPACE_KEYWORDS]:
+    if _namespace not in ALL_NAMESPACES:
+        print(f"Warning: routed namespace '{_namespace}' has no source PDF in SOURCE_PDFS.")
+
+def _normalize_word(word: str) -> str:
+    """Strips a simple plural so "emails" and "contacts" match their keywords."""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def route_query(query: str) -> list[str]:
+    """Picks the namespaces relevant to the query, falling back to the default namespace."""
+    words = [_normalize_word(word) for word in re.findall(r"[a-z0-9\-]+", query.lower())]
+
+    hits = {
+        namespace: sum(1 for word in words if word in keywords)
+        for namespace, keywords in NAMESPACE_KEYWORDS.items()
+    }
+    namespaces = [namespace for namespace, count in hits.items() if count > 0]
+
+    if not namespaces:
+        print(f"No namespace matched the query, searching '{DEFAULT_NAMESPACE}'.")
+        return [DEFAULT_NAMESPACE]
+
+    if max(hits.values()) < STRONG_MATCH_MIN_HITS and DEFAULT_NAMESPACE not in namespaces:
+        namespaces.append(DEFAULT_NAMESPACE)
+
+    print(f"Routing query to namespaces: {namespaces}")
+    return namespaces
@@ -1,45 +1,121 @@
 # backend/app/services/vectorstore.py
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-def store_in_pinecone(pinecone_index_obj, embedding, metadata: dict):
-    """Stores a single embedding with metadata into the Pinecone index."""
+from app.services.router import ALL_NAMESPACES
+
+# For these metrics a higher score means more similar. "euclidean" returns a
+# distance instead, so lower is better and the score thresholds below are skipped.
+SIMILARITY_METRICS = ("cosine", "dotproduct")
+
+# Matches scoring below this fraction of the best match are dropped.
+SCORE_DROPOFF_RATIO = 0.8
+
+# If the best routed match scores below this, the routing is treated as wrong
+# and the remaining namespaces are searched too.
+MIN_ROUTED_SCORE = 0.3
+
+def store_in_pinecone(pinecone_index_obj, embedding, metadata: dict, namespace: str = ""):
+    """Stores a single embedding with metadata into the given Pinecone namespace."""
     if pinecone_index_obj is None:
         print("Pinecone index object not provided to store_in_pinecone.")
         return
 
     try:
-        print(f"Storing embedding to Pinecone...")
+        print(f"Storing embedding to Pinecone namespace '{namespace}'...")
         pinecone_index_obj.upsert(
             vectors=[{
                 "id": str(uuid.uuid4()),  # generate a unique ID for each entry
                 "values": embedding,
                 "metadata": metadata
-            }]
+            }],
+            namespace=namespace
         )
         print("Embedding stored successfully.")
     except Exception as e:
         print(f"Error storing embedding to Pinecone: {e}")
 
-def query_vector_store(pinecone_index_obj, embedding, top_k: int = 3):
-    """Queries the Pinecone index with the given embedding."""
+def clear_namespace(pinecone_index_obj, namespace: str = ""):
+    """Deletes every vector in the given Pinecone namespace."""
     if pinecone_index_obj is None:
-        print("Pinecone index object not provided to query_vector_store.")
-        return []
+        print("Pinecone index object not provided to clear_namespace.")
+        return
 
     try:
-        print(f"Querying Pinecone with top_k={top_k}...")
+        print(f"Clearing Pinecone namespace '{namespace}'...")
+        pinecone_index_obj.delete(delete_all=True, namespace=namespace)
+        print("Namespace cleared successfully.")
+    except Exception as e:
+        # Deleting a namespace that holds no vectors raises on some index types
+        print(f"Error clearing Pinecone namespace '{namespace}': {e}")
+
+def _search_namespaces(pinecone_index_obj, embedding, top_k: int, namespaces: list[str], metric: str):
+    """Queries the namespaces concurrently and returns all matches sorted best first."""
+    def search(namespace):
         query_results = pinecone_index_obj.query(
             vector=embedding,
             top_k=top_k,
-            include_metadata=True  # include metadata to retrieve text
+            include_metadata=True,  # include metadata to retrieve text
+            namespace=namespace
         )
+        return query_results.matches if query_results and query_results.matches else []
+
+    if len(namespaces) == 1:
+        matches = search(namespaces[0])
+    else:
+        with ThreadPoolExecutor(max_workers=len(namespaces)) as executor:
+            matches = [match for results in executor.map(search, namespaces) for match in results]
+
+    return sorted(matches, key=lambda match: match.score, reverse=metric in SIMILARITY_METRICS)
+
+def _cut_at_score_dropoff(matches, top_k: int, metric: str = "cosine"):
+    """Keeps at most top_k matches, stopping once scores fall well below the best one."""
+    if not matches or metric not in SIMILARITY_METRICS or matches[0].score <= 0:
+        return matches[:top_k]
+
+    min_score = matches[0].score * SCORE_DROPOFF_RATIO
+    kept = []
+    for match in matches[:top_k]:
+        if match.score < min_score:
+            break
+        kept.append(match)
+    return kept
+
+def _is_weak(matches, metric: str) -> bool:
+    """Returns True if the routed matches are too poor to trust the routing."""
+    if not matches:
+        return True
+    return metric in SIMILARITY_METRICS and matches[0].score < MIN_ROUTED_SCORE
+
+def query_vector_store(pinecone_index_obj, embedding, top_k: int = 3, namespaces: Optional[list[str]] = None, metric: str = "cosine"):
+    """Queries the given Pinecone namespaces, widening to all namespaces if the matches are weak."""
+    if pinecone_index_obj is None:
+        print("Pinecone index object not provided to query_vector_store.")
+        return []
+
+    if not namespaces:
+        namespaces = ALL_NAMESPACES
+
+    try:
+        print(f"Querying Pinecone namespaces {namespaces} with top_k={top_k}...")
+        matches = _search_namespaces(pinecone_index_obj, embedding, top_k, namespaces, metric)
+
+        # At most one extra round: the remaining namespaces are searched together.
+        remaining = [namespace for namespace in ALL_NAMESPACES if namespace not in namespaces]
+        if remaining and _is_weak(matches, metric):
+            print(f"Weak matches in routed namespaces, also searching {remaining}.")
+            matches = sorted(
+                matches + _search_namespaces(pinecone_index_obj, embedding, top_k, remaining, metric),
+                key=lambda match: match.score,
+                reverse=metric in SIMILARITY_METRICS
+            )
 
         relevant_docs = []
-        if query_results and query_results.matches:
-            for match in query_results.matches:
-                if 'text' in match.metadata:
-                    relevant_docs.append(match.metadata['text'])
+        for match in _cut_at_score_dropoff(matches, top_k, metric):
+            if match.metadata and 'text' in match.metadata:
+                relevant_docs.append(match.metadata['text'])
 
         print(f"Found {len(relevant_docs)} relevant documents.")
         return relevant_docs
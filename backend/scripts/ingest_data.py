@@ -2,6 +2,7 @@
 
 import os
 import sys
+import argparse
 import pdfplumber
 import re
 
@@ -9,15 +10,13 @@ import re
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from app.services.embedding import get_embedding  # embedding function
-from app.services.vectorstore import store_in_pinecone  # function to STORE
+from app.services.vectorstore import store_in_pinecone, clear_namespace  # functions to STORE/CLEAR
+from app.services.router import SOURCE_PDFS, namespace_for_source  # per-source namespaces
 from app.main import pinecone_index_obj  # your initialized pinecone index
 
 # --- Constants ---
 PDF_FOLDER_PATH = os.path.join(os.path.dirname(__file__), "..", "data")
-PDF_FILES = [
-    "GENERAL.pdf",       
-    "CONTACTS.pdf",  
-]
+PDF_FILES = SOURCE_PDFS  # shared with the query router
 
 # --- Functions ---
 def load_pdf_text(pdf_path):
@@ -62,6 +61,12 @@ def split_text_into_chunks(text, max_length=500):
 
     return chunks
 
+def reset_namespaces(pdf_list):
+    """Clears the legacy default namespace and each target namespace before re-ingesting."""
+    clear_namespace(pinecone_index_obj, "")  # pre-partitioning vectors lived here
+    for pdf_file in pdf_list:
+        clear_namespace(pinecone_index_obj, namespace_for_source(pdf_file))
+
 def ingest_pdfs(pdf_folder, pdf_list):
     """Ingests multiple PDFs into the vector store."""
     total_entries = 0
@@ -73,12 +78,18 @@ def ingest_pdfs(pdf_folder, pdf_list):
             print(f"Skipping {pdf_file} because no entries were found.")
             continue
 
-        print(f"Preparing {len(knowledge_base_entries)} entries from {pdf_file} for ingestion...")
+        namespace = namespace_for_source(pdf_file)
+        print(f"Preparing {len(knowledge_base_entries)} entries from {pdf_file} for ingestion into namespace '{namespace}'...")
 
         for idx, entry in enumerate(knowledge_base_entries):
             try:
                 embedding = get_embedding(entry)  # Get embedding
-                store_in_pinecone(pinecone_index_obj, embedding, metadata={"text": entry})
+                store_in_pinecone(
+                    pinecone_index_obj,
+                    embedding,
+                    metadata={"text": entry, "source": pdf_file},
+                    namespace=namespace
+                )
                 print(f"Ingested entry {idx + 1}/{len(knowledge_base_entries)} from {pdf_file}")
                 total_entries += 1
             except Exception as e:
@@ -88,6 +99,16 @@ def ingest_pdfs(pdf_folder, pdf_list):
 
 # --- Main ---
 def main():
+    parser = argparse.ArgumentParser(description="Ingest PDFs into per-source Pinecone namespaces.")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="delete the default namespace and each target namespace before ingesting"
+    )
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_namespaces(PDF_FILES)
     ingest_pdfs(PDF_FOLDER_PATH, PDF_FILES)
 
 if __name__ == "__main__":
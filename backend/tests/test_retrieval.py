@@ -0,0 +1,126 @@
+# backend/tests/test_retrieval.py
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend folder to path for absolute imports
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.router import route_query
+from app.services.vectorstore import _cut_at_score_dropoff, query_vector_store
+
+
+def _match(score, text="chunk"):
+    return SimpleNamespace(score=score, metadata={"text": text})
+
+
+class FakeIndex:
+    """Stands in for a Pinecone index, returning canned matches per namespace."""
+
+    def __init__(self, matches_by_namespace):
+        self.matches_by_namespace = matches_by_namespace
+        self.queried = []
+
+    def query(self, vector, top_k, include_metadata, namespace):
+        # Namespaces may be queried concurrently, so the order of this list is not asserted
+        self.queried.append(namespace)
+        return SimpleNamespace(matches=self.matches_by_namespace.get(namespace, [])[:top_k])
+
+
+# --- Routing ---
+
+@pytest.mark.parametrize("query", [
+    "Who is eligible for the honors program?",
+    "How many credit hours do I need to graduate?",
+    "What is the number of credits for a minor?",
+    "Where is the campus located?",
+])
+def test_general_questions_search_default_namespace(query):
+    assert route_query(query) == ["general"]
+
+
+@pytest.mark.parametrize("query", [
+    "What is the admissions email?",
+    "List the contacts for admissions",
+    "Do you have phones for the library?",
+])
+def test_single_contact_term_also_searches_general(query):
+    assert route_query(query) == ["contacts", "general"]
+
+
+def test_several_contact_terms_search_contacts_only():
+    assert route_query("Phone and email contact for the registrar") == ["contacts"]
+
+
+# --- Fallback ---
+
+def test_strong_routed_match_skips_other_namespaces():
+    index = FakeIndex({"contacts": [_match(0.9, "phone")], "general": [_match(0.95, "catalog")]})
+    docs = query_vector_store(index, [0.0], top_k=5, namespaces=["contacts"])
+    assert docs == ["phone"]
+    assert index.queried == ["contacts"]
+
+
+def test_general_question_makes_one_query_call():
+    index = FakeIndex({"contacts": [_match(0.9, "phone")], "general": [_match(0.7, "catalog")]})
+    namespaces = route_query("How many credit hours do I need to graduate?")
+    assert query_vector_store(index, [0.0], top_k=5, namespaces=namespaces) == ["catalog"]
+    assert index.queried == ["general"]
+
+
+def test_single_contact_term_queries_each_namespace_once():
+    index = FakeIndex({"contacts": [_match(0.9, "phone")], "general": [_match(0.85, "catalog")]})
+    namespaces = route_query("What is the admissions email?")
+    assert query_vector_store(index, [0.0], top_k=5, namespaces=namespaces) == ["phone", "catalog"]
+    assert sorted(index.queried) == ["contacts", "general"]
+
+
+def test_weak_routed_match_falls_back_to_full_search():
+    index = FakeIndex({"contacts": [_match(0.1, "phone")], "general": [_match(0.7, "catalog")]})
+    docs = query_vector_store(index, [0.0], top_k=5, namespaces=["contacts"])
+    assert docs == ["catalog"]
+    assert index.queried == ["contacts", "general"]
+
+
+def test_euclidean_prefers_smallest_distance_and_skips_score_fallback():
+    index = FakeIndex({"contacts": [_match(0.1, "phone")], "general": [_match(0.05, "catalog")]})
+    assert query_vector_store(index, [0.0], top_k=5, namespaces=["contacts"], metric="euclidean") == ["phone"]
+    assert index.queried == ["contacts"]
+
+    index = FakeIndex({"contacts": [_match(1.5, "phone")], "general": [_match(0.2, "catalog")]})
+    docs = query_vector_store(index, [0.0], top_k=5, namespaces=["contacts", "general"], metric="euclidean")
+    assert docs == ["catalog", "phone"]
+
+
+def test_empty_routed_namespace_falls_back_to_full_search():
+    index = FakeIndex({"general": [_match(0.7, "catalog")]})
+    assert query_vector_store(index, [0.0], top_k=5, namespaces=["contacts"]) == ["catalog"]
+
+
+# --- Score dropoff ---
+
+def test_dropoff_empty_list():
+    assert _cut_at_score_dropoff([], top_k=5) == []
+
+
+def test_dropoff_non_positive_best_score_keeps_top_k():
+    matches = [_match(0.0), _match(-0.2), _match(-0.5)]
+    assert _cut_at_score_dropoff(matches, top_k=2) == matches[:2]
+
+
+def test_dropoff_all_scores_within_ratio_keeps_top_k():
+    matches = [_match(0.9), _match(0.85), _match(0.8), _match(0.75)]
+    assert _cut_at_score_dropoff(matches, top_k=3) == matches[:3]
+
+
+def test_dropoff_skipped_for_euclidean():
+    matches = [_match(0.1), _match(0.9)]
+    assert _cut_at_score_dropoff(matches, top_k=5, metric="euclidean") == matches
+
+
+def test_dropoff_stops_at_first_weak_score():
+    matches = [_match(0.9), _match(0.8), _match(0.5), _match(0.75)]
+    assert _cut_at_score_dropoff(matches, top_k=5) == matches[:2]